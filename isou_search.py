@@ -1,10 +1,67 @@
+import asyncio
+import importlib.util
+import socket
+import sys
+import time
+import types
+from urllib.parse import urlencode
 import requests 
-import json
-from typing import List, Dict, Any
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.exceptions import ProtocolError, ReadTimeoutError, SSLError
+from urllib3.util.request import ACCEPT_ENCODING
+from typing import List, Dict, Any, AsyncIterable, AsyncIterator, Callable, Generator, Iterable, Iterator, Optional, Union
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from enum import Enum
 
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# HTTP/2 support in httpx needs the optional h2 package
+_HAS_H2 = importlib.util.find_spec('h2') is not None
+
+# Slotted dataclasses are only available on Python 3.10+
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# gzip/deflate, plus br when a Brotli decoder is installed; zstd is decoded by the provider itself
+_ACCEPT_ENCODING = ACCEPT_ENCODING if zstandard is None or 'zstd' in ACCEPT_ENCODING else 'zstd,' + ACCEPT_ENCODING
+
+# Request headers shared by every provider instance (read-only)
+_DEFAULT_HEADERS = types.MappingProxyType({
+    'Accept': 'text/event-stream',
+    'Accept-Encoding': _ACCEPT_ENCODING,
+    'Accept-Language': 'en-US,en;q=0.8',
+    'Connection': 'keep-alive',
+    'Content-Type': 'application/json',
+    'Origin': 'https://isou.chat',
+    'Sec-Fetch-Dest': 'empty',
+    'Sec-Fetch-Mode': 'cors',
+    'Sec-Fetch-Site': 'same-origin',
+    'Sec-GPC': '1',
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
+    'sec-ch-ua': '"Brave";v="131", "Chromium";v="131", "Not_A_Brand";v="24"',
+    'sec-ch-ua-mobile': '?0',
+    'sec-ch-ua-platform': '"Windows"',
+})
+
 class SearchModeError(Exception):
     """Exception raised for invalid search modes."""
     pass
@@ -31,7 +88,7 @@ class SearchCategory(Enum):
     GENERAL = "general"
     SCIENCE = "science"
 
-@dataclass
+@dataclass(**_SLOTS)
 class ImageResult:
     """Dataclass to represent image search results."""
     id: str = ''
@@ -50,6 +107,32 @@ class SearchResult:
     answer: str = ''
     related: str = ''
 
+if msgspec is not None:
+    class _Frame(msgspec.Struct):
+        """Typed view of the inner ``data`` payload of an event-stream frame."""
+        image: Optional[ImageResult] = None
+        answer: Optional[str] = None
+        related: Optional[str] = None
+    
+    class _Envelope(msgspec.Struct):
+        """Outer event-stream frame; ``data`` is either a JSON-encoded string or an object."""
+        data: Union[str, _Frame] = ''
+    
+    _ENVELOPE_DECODER = msgspec.json.Decoder(_Envelope)
+    _FRAME_DECODER = msgspec.json.Decoder(_Frame)
+
+class _StreamingHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose sockets use a larger receive buffer for long event streams."""
+    
+    # urllib3's defaults already enable TCP_NODELAY
+    SOCKET_OPTIONS = HTTPConnection.default_socket_options + [
+        (socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20),
+    ]
+    
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs.setdefault('socket_options', self.SOCKET_OPTIONS)
+        super().init_poolmanager(*args, **kwargs)
+
 class BaseSearchProvider(ABC):
     """Abstract base class for search providers."""
     
@@ -62,13 +145,19 @@ class IsouAISearchProvider(BaseSearchProvider):
     """Concrete implementation of IsouAI search provider."""
     
     DEFAULT_TIMEOUT = 10
+    DEFAULT_MAX_CONCURRENCY = 8
     BASE_URL = "https://isou.chat/api/search"
+    STREAM_CHUNK_SIZE = 65536
+    STREAM_FLUSH_WRITES = 32
+    STREAM_FLUSH_INTERVAL = 0.016
     
     def __init__(self, 
                  mode: SearchMode = SearchMode.SIMPLE, 
                  category: SearchCategory = SearchCategory.SCIENCE,
                  timeout: int = DEFAULT_TIMEOUT,
-                 stream: bool = True):
+                 stream: bool = True,
+                 on_token: Optional[Callable[[str], None]] = None,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
         """
         Initialize the IsouAI search provider.
         
@@ -77,33 +166,66 @@ class IsouAISearchProvider(BaseSearchProvider):
             category: Search category
             timeout: Request timeout in seconds
             stream: Whether to stream the response
+            on_token: Optional callback receiving each streamed answer token;
+                when omitted, tokens are written to stdout and flushed periodically
+            max_concurrency: Maximum number of in-flight requests for ``search_many``
+        
+        Raises:
+            ValueError: If ``max_concurrency`` is less than 1
         """
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
         self._mode = mode
         self._category = category
         self._timeout = timeout
         self._stream = stream
-        self._headers = self._generate_headers()
+        self._on_token = on_token
+        self._max_concurrency = max_concurrency
+        self._headers = _DEFAULT_HEADERS
+        self._session = requests.Session()
+        self._session.headers.update(_DEFAULT_HEADERS)
+        self._session.mount('https://', _StreamingHTTPAdapter(pool_connections=4, pool_maxsize=16))
+        self._payload_bytes = self._serialize_payload(self._prepare_request_payload())
+        
+        # Headers, body and environment settings never change, so prepare them once and
+        # only swap the URL (and refresh cookies) per search
+        self._prepared = self._session.prepare_request(
+            requests.Request('POST', self.BASE_URL, data=self._payload_bytes)
+        )
+        self._send_kwargs = self._session.merge_environment_settings(self.BASE_URL, {}, True, None, None)
+        self._async_client = None
+        self._async_client_loop = None
     
-    def _generate_headers(self) -> Dict[str, str]:
-        """Generate headers for the HTTP request."""
-        return {
-            'Accept': 'text/event-stream',
-            'Accept-Language': 'en-US,en;q=0.8',
-            'Connection': 'keep-alive',
-            'Content-Type': 'application/json',
-            'Origin': 'https://isou.chat',
-            'Sec-Fetch-Dest': 'empty',
-            'Sec-Fetch-Mode': 'cors',
-            'Sec-Fetch-Site': 'same-origin',
-            'Sec-GPC': '1',
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
-            'sec-ch-ua': '"Brave";v="131", "Chromium";v="131", "Not_A_Brand";v="24"',
-            'sec-ch-ua-mobile': '?0',
-            'sec-ch-ua-platform': '"Windows"',
-        }
+    def close(self) -> None:
+        """Close the underlying HTTP session and release pooled connections."""
+        self._session.close()
+        # The async client can only be closed from its own event loop (see ``aclose``);
+        # dropping it here lets the next loop start with a fresh one
+        self._async_client = None
+        self._async_client_loop = None
+    
+    def __enter__(self) -> 'IsouAISearchProvider':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    async def aclose(self) -> None:
+        """Close the HTTP session and the async client, if one was created on this event loop."""
+        client = self._async_client
+        owned = client is not None and self._async_client_loop is asyncio.get_running_loop()
+        self.close()
+        if owned:
+            await client.aclose()
+    
+    async def __aenter__(self) -> 'IsouAISearchProvider':
+        return self
     
-    def _prepare_request_payload(self, query: str) -> Dict[str, Any]:
-        """Prepare the JSON payload for the request."""
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.aclose()
+    
+    def _prepare_request_payload(self) -> Dict[str, Any]:
+        """Prepare the JSON payload for the request (the query itself travels in the URL)."""
         return {
             'stream': True,
             'model': 'yi-lightning',
@@ -116,6 +238,201 @@ class IsouAISearchProvider(BaseSearchProvider):
             'reload': False,
         }
     
+    @staticmethod
+    def _serialize_payload(payload: Dict[str, Any]) -> bytes:
+        """Serialize the request payload to UTF-8 JSON bytes."""
+        body = _json.dumps(payload)
+        return body.encode('utf-8') if isinstance(body, str) else body
+    
+    @staticmethod
+    def _iter_line_batches(chunks: Iterable[bytes]) -> Iterator[List[bytes]]:
+        """Split raw byte chunks into the complete lines each one finishes, keeping the partial tail buffered."""
+        buf = bytearray()
+        for chunk in chunks:
+            buf += chunk
+            lines = buf.split(b"\n")
+            buf = bytearray(lines.pop())
+            yield lines
+        if buf:
+            yield [buf]
+    
+    def _iter_chunks(self, response: requests.Response) -> Iterator[bytes]:
+        """Yield decoded body chunks, decompressing zstd responses with a streaming decompressor."""
+        if zstandard is not None and response.headers.get('Content-Encoding') == 'zstd':
+            # Servers may flush one zstd frame per event; keep decoding past each frame end
+            decompressor = zstandard.ZstdDecompressor().decompressobj(read_across_frames=True)
+            # Reading response.raw directly bypasses iter_content, so map urllib3 and zstd
+            # errors to requests exceptions the same way it does
+            try:
+                for chunk in response.raw.stream(self.STREAM_CHUNK_SIZE, decode_content=False):
+                    data = decompressor.decompress(chunk)
+                    if data:
+                        yield data
+            except ProtocolError as e:
+                raise requests.exceptions.ChunkedEncodingError(e)
+            except ReadTimeoutError as e:
+                raise requests.exceptions.ConnectionError(e)
+            except SSLError as e:
+                raise requests.exceptions.SSLError(e)
+            except zstandard.ZstdError as e:
+                raise requests.exceptions.ContentDecodingError(e)
+        else:
+            yield from response.iter_content(chunk_size=self.STREAM_CHUNK_SIZE, decode_unicode=False)
+    
+    @staticmethod
+    async def _aiter_line_batches(chunks: AsyncIterable[bytes]) -> AsyncIterator[List[bytes]]:
+        """Async counterpart of ``_iter_line_batches`` for raw byte chunks from httpx."""
+        buf = bytearray()
+        async for chunk in chunks:
+            buf += chunk
+            lines = buf.split(b"\n")
+            buf = bytearray(lines.pop())
+            yield lines
+        if buf:
+            yield [buf]
+    
+    def _frame_parser(self, result: SearchResult) -> Generator[None, Optional[bytes], None]:
+        """
+        Consume raw event-stream lines sent in via ``send()`` and accumulate them into ``result``.
+        
+        Sending ``None`` marks the end of a network chunk and flushes any tokens written to
+        stdout for it. The answer and related text are joined into ``result`` once the generator
+        is closed, which lets the synchronous and asynchronous transports share one parsing loop.
+        """
+        answer_parts: List[str] = []
+        related_parts: List[str] = []
+        
+        # Local aliases keep attribute/global lookups out of the per-frame loop
+        _loads = _json.loads
+        decode_envelope = _ENVELOPE_DECODER.decode if msgspec is not None else None
+        decode_frame = _FRAME_DECODER.decode if msgspec is not None else None
+        append_image = result.images.append
+        append_answer = answer_parts.append
+        append_related = related_parts.append
+        stream = self._stream
+        on_token = self._on_token
+        # stdout is only touched when tokens are actually streamed to it (it may be None)
+        if stream and on_token is None:
+            write = sys.stdout.write
+            flush = sys.stdout.flush
+        monotonic = time.monotonic
+        pending_writes = 0
+        last_flush = monotonic()
+        
+        try:
+            while True:
+                value = yield
+                if value is None:
+                    # End of a network chunk: don't leave its tokens sitting in stdout's buffer
+                    # while waiting for the next one
+                    if pending_writes:
+                        flush()
+                        pending_writes = 0
+                        last_flush = monotonic()
+                    continue
+                if not value.startswith(b"data:"):
+                    continue
+                json_str = value[5:].lstrip()
+                
+                # Skip empty frames and sentinels such as [DONE] that can't hold a JSON payload
+                if not json_str or json_str == b"[DONE]" or json_str[:1] not in (b"{", b"["):
+                    continue
+                
+                # Skip keepalive/heartbeat frames without touching the JSON parser
+                if b'image' not in json_str and b'answer' not in json_str and b'related' not in json_str:
+                    continue
+                
+                image = None
+                frame = None
+                if decode_envelope is not None:
+                    # Typed single-pass decode straight into ImageResult/str fields
+                    try:
+                        frame = decode_envelope(json_str).data
+                        if isinstance(frame, str):
+                            frame = decode_frame(frame)
+                    except msgspec.ValidationError:
+                        # Unexpected field types (e.g. nulls) fall back to the lenient path below
+                        frame = None
+                    except msgspec.DecodeError:
+                        continue
+                
+                if frame is not None:
+                    image = frame.image
+                    token = frame.answer
+                    related_text = frame.related
+                else:
+                    try:
+                        # Safely parse the JSON data (kept as raw bytes, no UTF-8 decode)
+                        parsed_json = _loads(json_str)
+                        data = parsed_json.get('data', '{}')
+                        
+                        # Decode the inner payload only when it is a JSON-encoded string
+                        if isinstance(data, str) and data.lstrip()[:1] in ('{', '['):
+                            data = _loads(data)
+                    except (_json.JSONDecodeError, ValueError, TypeError, KeyError, AttributeError):
+                        continue
+                    
+                    # Ensure data is a dictionary
+                    if not isinstance(data, dict):
+                        continue
+                    
+                    image_data = data.get('image')
+                    if isinstance(image_data, dict):
+                        get = image_data.get
+                        # Positional, in ImageResult field order
+                        fields = (
+                            get('id') or '',
+                            get('name') or '',
+                            get('source') or '',
+                            get('url') or '',
+                            get('img') or '',
+                            get('thumbnail') or '',
+                            get('snippet') or '',
+                            get('engine') or '',
+                        )
+                        # The API sends strings; str.join type-checks every field in one C-level
+                        # pass, so coercion only runs when a malformed image slips through
+                        try:
+                            "".join(fields)
+                        except TypeError:
+                            fields = tuple(f if isinstance(f, str) else str(f) for f in fields)
+                        image = ImageResult(*fields)
+                    token = data.get('answer')
+                    related_text = data.get('related')
+                
+                # Process images
+                if image is not None:
+                    append_image(image)
+                
+                # Process text responses
+                if token is not None:
+                    if not isinstance(token, str):
+                        token = str(token)
+                    append_answer(token)
+                    
+                    if stream:
+                        if on_token is not None:
+                            on_token(token)
+                        else:
+                            # Write straight into stdout's buffer and flush periodically so the
+                            # parser isn't paced by terminal I/O
+                            write(token)
+                            pending_writes += 1
+                            now = monotonic()
+                            if pending_writes >= self.STREAM_FLUSH_WRITES or now - last_flush >= self.STREAM_FLUSH_INTERVAL:
+                                flush()
+                                pending_writes = 0
+                                last_flush = now
+                
+                if related_text:
+                    append_related(related_text if isinstance(related_text, str) else str(related_text))
+        finally:
+            if pending_writes:
+                flush()
+            
+            result.answer = "".join(answer_parts)
+            result.related = "".join(related_parts)
+    
     def search(self, query: str) -> SearchResult:
         """
         Perform a search using IsouAI.
@@ -129,72 +446,145 @@ class IsouAISearchProvider(BaseSearchProvider):
         Raises:
             NetworkError: If there's an issue with the network request
             ResponseParsingError: If parsing the response fails
+        
+        Note:
+            Proxy and CA-bundle environment variables are read once, when the provider
+            is created; cookies set by earlier responses are sent with every search.
         """
         try:
-            response = requests.post(
-                self.BASE_URL, 
-                params={'q': query}, 
-                headers=self._headers, 
-                json=self._prepare_request_payload(query), 
-                stream=True, 
-                timeout=self._timeout
-            )
+            prepared = self._prepared.copy()
+            prepared.url = f"{self.BASE_URL}?{urlencode({'q': query})}"
+            prepared.prepare_cookies(self._session.cookies)
+            # Closing the streamed response returns its connection to the pool even if
+            # the stream fails part-way through
+            with self._session.send(prepared, timeout=self._timeout, **self._send_kwargs) as response:
+                # Process response
+                result = SearchResult()
+                parser = self._frame_parser(result)
+                next(parser)
+                send = parser.send
+                for lines in self._iter_line_batches(self._iter_chunks(response)):
+                    for value in lines:
+                        send(value)
+                    send(None)
+                parser.close()
             
-            # Process response
-            images = []
-            answer = ""
-            related = ""
-            
-            for value in response.iter_lines(decode_unicode=True, chunk_size=1000):
-                if value and value.startswith("data:"):
-                    try:
-                        # Safely parse the JSON data
-                        json_str = value[5:]
-                        parsed_json = json.loads(json_str)
-                        data_str = parsed_json.get('data', '{}')
-                        
-                        # Ensure data is a dictionary
-                        data = json.loads(data_str) if isinstance(data_str, str) else data_str
-                        
-                        # Process images
-                        if 'image' in data:
-                            # Ensure image is a dictionary and has required fields
-                            image_data = data['image']
-                            if isinstance(image_data, dict):
-                                images.append(ImageResult(**{k: str(v or '') for k, v in image_data.items()}))
-                        
-                        # Process text responses
-                        if data.get('answer') is not None:
-                            answer += str(data['answer'])
-                            
-                        if self._stream and 'answer' in data:
-                            if data['answer'] is not None:
-                                print(data['answer'], end="", flush=True)
-                        
-                        if data.get('related'):
-                            related += str(data['related'])
-                    
-                    except:
-                        continue
-            
-            return SearchResult(images=images, answer=answer, related=related)
+            return result
         
         except requests.RequestException as e:
             raise NetworkError(f"Network error occurred: {e}")
         except Exception as e:
             raise ResponseParsingError(f"Unexpected error: {e}")
+    
+    def _get_async_client(self) -> 'httpx.AsyncClient':
+        """
+        Lazily create the HTTP/2 capable async client used by ``asearch``.
+        
+        The client's connections belong to the event loop that created it, so a new client
+        is built whenever ``asearch`` runs on a different loop (e.g. a second ``asyncio.run``).
+        Use ``async with`` (or ``aclose()``) on that loop to close its connections deterministically.
+        """
+        if httpx is None:
+            raise ImportError("asearch requires httpx: pip install 'httpx[http2]'")
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            # Connection-specific headers are not allowed over HTTP/2
+            headers = {k: v for k, v in self._headers.items() if k != 'Connection'}
+            self._async_client = httpx.AsyncClient(
+                http2=_HAS_H2,
+                headers=headers,
+                timeout=self._timeout,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+            )
+            self._async_client_loop = loop
+        return self._async_client
+    
+    async def asearch(self, query: str) -> SearchResult:
+        """
+        Perform a search using IsouAI without blocking the event loop.
+        
+        Concurrent calls share one keep-alive (HTTP/2 when ``h2`` is installed) connection.
+        
+        Args:
+            query: Search query string
+        
+        Returns:
+            SearchResult containing images, answer, and related information
+        
+        Raises:
+            NetworkError: If there's an issue with the network request
+            ResponseParsingError: If parsing the response fails
+        """
+        client = self._get_async_client()
+        try:
+            async with client.stream(
+                "POST",
+                self.BASE_URL,
+                params={'q': query},
+                content=self._payload_bytes,
+            ) as response:
+                # Process response
+                result = SearchResult()
+                parser = self._frame_parser(result)
+                next(parser)
+                send = parser.send
+                async for lines in self._aiter_line_batches(response.aiter_bytes()):
+                    for value in lines:
+                        send(value)
+                    send(None)
+                parser.close()
+            
+            return result
+        
+        except httpx.HTTPError as e:
+            raise NetworkError(f"Network error occurred: {e}")
+        except Exception as e:
+            raise ResponseParsingError(f"Unexpected error: {e}")
+    
+    async def search_many(self, queries: List[str]) -> List[SearchResult]:
+        """
+        Run several searches concurrently, overlapping their network latency.
+        
+        At most ``max_concurrency`` requests are in flight at once; if any search fails, the
+        remaining ones are cancelled. Streamed tokens from concurrent searches interleave, so
+        consider ``stream=False`` or an ``on_token`` callback.
+        
+        Args:
+            queries: Search query strings
+        
+        Returns:
+            SearchResult for each query, in the same order as ``queries``
+        
+        Raises:
+            NetworkError: If there's an issue with any of the network requests
+            ResponseParsingError: If parsing any of the responses fails
+        """
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+        
+        async def _asearch_one(query: str) -> SearchResult:
+            async with semaphore:
+                return await self.asearch(query)
+        
+        tasks = [asyncio.ensure_future(_asearch_one(q)) for q in queries]
+        try:
+            return list(await asyncio.gather(*tasks))
+        finally:
+            # On the first failure (or cancellation) stop the sibling searches instead of
+            # leaving them streaming against a client that may be closed next
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
 def main():
     """Example usage of the IsouAI search provider."""
     try:
         # Create a search provider with custom settings
-        search_provider = IsouAISearchProvider(
+        with IsouAISearchProvider(
             mode=SearchMode.SIMPLE, 
             category=SearchCategory.SCIENCE
-        )
-        
-        # Perform search
-        result = search_provider.search("what is the current AQI in Delhi?")
+        ) as search_provider:
+            # Perform search
+            result = search_provider.search("what is the current AQI in Delhi?")
         
         # Print image results
         for image in result.images:
@@ -4,13 +4,12 @@ def main():
     """Example usage of the IsouAI search provider."""
     try:
         # Create a search provider with custom settings
-        search_provider = IsouAISearchProvider(
+        with IsouAISearchProvider(
             mode=SearchMode.SIMPLE, 
             category=SearchCategory.SCIENCE
-        )
-        
-        # Perform search
-        result = search_provider.search("what is the current AQI in Delhi?")
+        ) as search_provider:
+            # Perform search
+            result = search_provider.search("what is the current AQI in Delhi?")
         
         # Print image results
         for image in result.images: